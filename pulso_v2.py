@@ -1,13 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
 import time
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import accumulate
 
 @dataclass
 class BreathingPattern:
-    phases: list[float]
+    name: str
+    phases: tuple[float, ...]
     uses_pace: bool
-    labels: list[str]
+    labels: tuple[str, ...]
+    total: float = field(init=False)
+    cum: tuple[float, ...] = field(init=False)    # start offset of each phase
+    inv_d: tuple[float, ...] = field(init=False)  # 1 / duration of each phase
+
+    def __post_init__(self):
+        self.total = sum(self.phases)
+        self.cum = (0,) + tuple(accumulate(self.phases))[:-1]
+        self.inv_d = tuple(1 / d for d in self.phases)
 
 class BreathingApp:
     MIN_BREATH_PACE = 2.0
@@ -16,40 +28,55 @@ class BreathingApp:
     MIN_SESSION_DURATION = 0.5
     MAX_SESSION_DURATION = 60.0
     DEFAULT_SESSION_DURATION = 5.0
+    DEFAULT_PATTERN = 0
     CANVAS_SIZE = 300
     CIRCLE_PADDING = 15
     UPDATE_INTERVAL = 16  # ~60 FPS
+    FRAME_WINDOW = 60  # frames of timer overshoot used to fit the next delay
+    _ARC_SCALE = 359.99  # degrees of arc at full phase progress (360 would draw nothing)
+    _RING_EXTENT = 359.999  # outline ring drawn as an arc, just short of 360 for the same reason
+    SCALE_STEPS = 256  # circle scale resolution (~0.5 px of radius per step)
+
+    # Built once per process; the radio buttons select by index
+    patterns = (
+        BreathingPattern("Balanced (1:1)", (1, 1), True,  ("inhale", "exhale")),
+        BreathingPattern("Calm (1:2)",     (1, 2), True,  ("inhale", "exhale")),
+        BreathingPattern("Vitality (2:1)", (2, 1), True,  ("inhale", "exhale")),
+        BreathingPattern("4-7-8 (+hold)",  (4, 7, 8), False, ("inhale", "hold", "exhale")),
+    )
 
     PHASE_COLORS = {"inhale": "#3498db", "hold": "#2ecc71", "exhale": "#e67e22"}
-    SCALE_FACTORS = {
-        "inhale": lambda p: 0.2 + 0.8 * p,
-        "exhale": lambda p: 1.0 - 0.8 * p,
-        "hold":   lambda _: 1.0
-    }
+    # Circle scale per phase as (a, b) in a + b * progress
+    PHASE_COEFFS = {"inhale": (0.2, 0.8), "exhale": (1.0, -0.8), "hold": (1.0, 0.0)}
 
     def __init__(self, master):
         self.master = master
         master.title("Breathing Exercise Assistant")
         master.geometry("500x800")
 
-        self.patterns = {
-            "Balanced (1:1)": BreathingPattern([1, 1], True,  ["inhale", "exhale"]),
-            "Calm (1:2)":     BreathingPattern([1, 2], True,  ["inhale", "exhale"]),
-            "Vitality (2:1)": BreathingPattern([2, 1], True,  ["inhale", "exhale"]),
-            "4-7-8 (+hold)":  BreathingPattern([4, 7, 8], False, ["inhale", "hold", "exhale"])
-        }
-
-        self.selected_pattern = tk.StringVar(value="Balanced (1:1)")
+        self.selected_pattern = tk.IntVar(value=self.DEFAULT_PATTERN)
+        self._activate_pattern(self.patterns[self.DEFAULT_PATTERN])
         self.breath_pace = tk.DoubleVar(value=self.DEFAULT_BREATH_PACE)
+        # Cycle time mirrored from breath_pace so frames don't read the Tcl variable
+        self._cycle_time = 60 / self.DEFAULT_BREATH_PACE
+        self.breath_pace.trace_add("write", self._sync_pace)
         self.session_duration = tk.DoubleVar(value=self.DEFAULT_SESSION_DURATION)
         self.is_running = False
-        self.current_phase = "exhale"
         self.progress = 0
         self.scheduled_end = None
+        self._tick_id = None
+        self._visible = True
+        self._last_tick = time.perf_counter()
+        self._last_delay = None
+        self._overshoot = deque(maxlen=self.FRAME_WINDOW)
+
+        self._scale_text = {}  # label -> text currently shown next to each slider
 
         self._configure_styles()
         self._create_widgets()
         self.reset_visuals()
+        master.bind("<Unmap>", self._handle_unmap)
+        master.bind("<Map>", self._handle_map)
 
     def _configure_styles(self):
         style = ttk.Style()
@@ -60,21 +87,37 @@ class BreathingApp:
         # Pattern selection
         ttk.Label(self.master, text="Select Breathing Pattern:").pack(pady=(20, 5))
         f = ttk.Frame(self.master); f.pack()
-        for name in self.patterns:
-            ttk.Radiobutton(f, text=name, variable=self.selected_pattern,
-                            value=name, command=self._handle_pattern_change
+        for i, pat in enumerate(self.patterns):
+            ttk.Radiobutton(f, text=pat.name, variable=self.selected_pattern,
+                            value=i, command=self._handle_pattern_change
             ).pack(side=tk.LEFT, padx=5)
 
         # Canvas & circle
-        self.canvas = tk.Canvas(self.master, width=self.CANVAS_SIZE, height=self.CANVAS_SIZE)
+        # No border or focus ring, so redraws stay within the animated items
+        self.canvas = tk.Canvas(self.master, width=self.CANVAS_SIZE, height=self.CANVAS_SIZE,
+                                bd=0, highlightthickness=0, bg=self.master.cget("bg"))
         self.canvas.pack(pady=20)
+        # Raw Tcl entry points for the per-frame canvas commands
+        self._tk_call = self.canvas.tk.call
+        self._canvas_path = str(self.canvas)
         c = self.CANVAS_SIZE // 2
         r = c - self.CIRCLE_PADDING
         coords = (c - r, c - r, c + r, c + r)
-        self.circle = self.canvas.create_oval(*coords, outline="#ecf0f1", width=6)
+        self._coord_lut = [
+            (c - sr, c - sr, c + sr, c + sr)
+            for sr in (i * r / self.SCALE_STEPS for i in range(self.SCALE_STEPS + 1))
+        ]
+        self.circle = self.canvas.create_arc(*coords, start=0, extent=self._RING_EXTENT, width=6,
+                                             outline="#ecf0f1", style="arc")
         self.arc = self.canvas.create_arc(*coords, start=90, extent=0, width=6,
                                           outline=self.PHASE_COLORS["inhale"], style="arc")
         self.text = self.canvas.create_text(c, c, text="Ready", font=("Arial", 18, "bold"))
+        # Last values pushed to the canvas, so frames only send what changed
+        self._last_extent = 0
+        self._last_outline = self.PHASE_COLORS["inhale"]
+        self._last_text_key = None  # (phase index, tenths of a second) shown
+        self._last_scale = 1.0
+        self._last_scale_idx = self.SCALE_STEPS
 
         # Sliders
         f2 = ttk.Frame(self.master); f2.pack(fill=tk.X, padx=20, pady=10)
@@ -96,101 +139,176 @@ class BreathingApp:
 
     def _create_scale(self, parent, row, lbl_text, var, min_v, max_v, step, unit):
         ttk.Label(parent, text=lbl_text).grid(row=row, column=0, sticky="w")
+        fmt = "{:.1f}" if unit == "bpm" else "{:g}"
+        suffix = f" {unit}"
         scale = ttk.Scale(
             parent, from_=min_v, to=max_v, variable=var,
-            command=lambda v: self._update_scale(v, var, lbl, min_v, max_v, step, unit)
+            command=lambda v: self._update_scale(v, var, lbl, min_v, max_v, step, fmt, suffix)
         )
         scale.grid(row=row, column=1, sticky="ew")
-        val_str = f"{var.get():.1f}" if unit == "bpm" else f"{var.get():g}"
-        lbl = ttk.Label(parent, text=f"{val_str} {unit}")
+        lbl = ttk.Label(parent)
         lbl.grid(row=row, column=2, padx=5)
+        self._show_scale_value(lbl, fmt.format(var.get()) + suffix)
         return scale, lbl
 
-    def _update_scale(self, value, var, label, mn, mx, step, unit):
-        try:
-            scaled = round(float(value) / step) * step
-            clamped = max(mn, min(scaled, mx))
+    def _update_scale(self, value, var, label, mn, mx, step, fmt, suffix):
+        raw = float(value)
+        clamped = max(mn, min(round(raw / step) * step, mx))
+        if abs(clamped - raw) > 1e-9:
             var.set(clamped)
-            txt = f"{clamped:.1f}" if unit == "bpm" else f"{clamped:g}"
-            label.config(text=f"{txt} {unit}")
-        except:
-            var.set(var.get())
-            self.master.bell()
+        self._show_scale_value(label, fmt.format(clamped) + suffix)
+
+    def _show_scale_value(self, label, txt):
+        if self._scale_text.get(label) != txt:
+            label.config(text=txt)
+            self._scale_text[label] = txt
+
+    def _activate_pattern(self, p):
+        self._active_pattern = p
+        self._phase_coeffs = [self.PHASE_COEFFS[l] for l in p.labels]
+        self._phase_colors = [self.PHASE_COLORS[l] for l in p.labels]
+        self._phase_display = [l.capitalize() for l in p.labels]
+        self._phase_idx = -1  # last phase (exhale) until the next frame
+        self._last_text_key = None  # phase indices now name different phases
+
+    @property
+    def current_phase(self):
+        return self._active_pattern.labels[self._phase_idx]
+
+    def _sync_pace(self, *_):
+        self._cycle_time = 60 / self.breath_pace.get()
 
     def _handle_pattern_change(self):
         p = self.patterns[self.selected_pattern.get()]
+        self._activate_pattern(p)
         state = "normal" if p.uses_pace else "disabled"
         self.breath_scale.config(state=state)
         self.breath_pace_label.config(style="TLabel" if p.uses_pace else "Dis.TLabel")
 
+    def _handle_unmap(self, event):
+        # Child widgets share the toplevel's bindtag; only react to the window itself
+        if event.widget is not self.master: return
+        self._visible = False
+        if self._tick_id:
+            self.master.after_cancel(self._tick_id)
+        self._tick_id = None
+
+    def _handle_map(self, event):
+        if event.widget is not self.master or self._visible: return
+        self._visible = True
+        if self.is_running and self._tick_id is None:
+            # _last_tick still marks the last drawn frame, so the first frame back
+            # advances progress by the whole hidden interval; keep it out of the
+            # overshoot statistics.
+            self._last_delay = None
+            self._tick_id = self.master.after_idle(self._run_breathing_cycle)
+
     def toggle_session(self):
-        self.is_running = not self.is_running
+        if self.is_running:
+            self.stop_session()
+        else:
+            self.is_running = True
         self.start_stop_button.config(text="Stop" if self.is_running else "Start")
         if self.is_running:
             ms = int(self.session_duration.get() * 60 * 1000)
             self.scheduled_end = self.master.after(ms, self.stop_session)
-            self._run_breathing_cycle()
-        else:
-            self.stop_session()
+            self._last_tick = time.perf_counter()
+            self._last_delay = None
+            self._overshoot.clear()
+            self._schedule_next_frame()
 
     def stop_session(self):
-        if self.is_running:
-            self.is_running = False
-            if self.scheduled_end:
-                self.master.after_cancel(self.scheduled_end)
-            self.scheduled_end = None
+        self.is_running = False
+        if self.scheduled_end:
+            self.master.after_cancel(self.scheduled_end)
+        self.scheduled_end = None
+        if self._tick_id:
+            self.master.after_cancel(self._tick_id)
+        self._tick_id = None
         self.reset_visuals()
 
     def reset_settings(self):
         self.stop_session()
         self.breath_pace.set(self.DEFAULT_BREATH_PACE)
         self.session_duration.set(self.DEFAULT_SESSION_DURATION)
-        self.selected_pattern.set("Balanced (1:1)")
-        self.breath_pace_label.config(text=f"{self.DEFAULT_BREATH_PACE:.1f} bpm")
-        self.session_duration_label.config(text=f"{self.DEFAULT_SESSION_DURATION:g} min")
+        self.selected_pattern.set(self.DEFAULT_PATTERN)
+        self._show_scale_value(self.breath_pace_label, f"{self.DEFAULT_BREATH_PACE:.1f} bpm")
+        self._show_scale_value(self.session_duration_label, f"{self.DEFAULT_SESSION_DURATION:g} min")
         self._handle_pattern_change()
 
     def reset_visuals(self):
         self.progress = 0
-        self.current_phase = "exhale"
+        self._phase_idx = -1  # last phase (exhale) while idle
         self.canvas.itemconfig(self.arc, extent=0, outline=self.PHASE_COLORS["inhale"])
         self.canvas.itemconfig(self.text, text="Ready")
+        self._last_extent = 0
+        self._last_outline = self.PHASE_COLORS["inhale"]
+        self._last_text_key = None
+        self._last_scale = None
+        self._last_scale_idx = None
         self._update_circle_size(1.0)
 
     def _run_breathing_cycle(self):
         if not self.is_running: return
-        pat = self.patterns[self.selected_pattern.get()]
-        total = sum(pat.phases)
-        cycle_time = 60 / self.breath_pace.get() if pat.uses_pace else total
-        self.progress = (self.progress + self.UPDATE_INTERVAL / (cycle_time * 1000)) % 1
-        phase, prog, rem = self._calc_phase_progress(self.progress, pat, total)
-        self.current_phase = phase
-        self._update_visuals(prog, rem, phase)
-        self.master.after(self.UPDATE_INTERVAL, self._run_breathing_cycle)
-
-    def _calc_phase_progress(self, norm, pat, total):
-        t = norm * total
-        c = 0
-        for i, d in enumerate(pat.phases):
-            if t < c + d:
-                e = t - c
-                return pat.labels[i], e / d, (d - e)
-            c += d
-        # Fallback: last phase
-        return pat.labels[-1], 1.0, 0.0
-
-    def _update_visuals(self, prog, rem, phase):
-        ext = min(359.99, 359.99 * prog)
-        self.canvas.itemconfig(self.arc, outline=self.PHASE_COLORS[phase], extent=ext)
-        self.canvas.itemconfig(self.text, text=f"{phase.capitalize()}\n{rem:.1f}s")
-        self._update_circle_size(self.SCALE_FACTORS[phase](prog))
+        now = time.perf_counter()
+        dt_ms = (now - self._last_tick) * 1000
+        self._last_tick = now
+        if self._last_delay is not None:
+            # Time spent beyond the requested delay: Tk timer slack plus frame work
+            self._overshoot.append(dt_ms - self._last_delay)
+        pat = self._active_pattern
+        cycle_time = self._cycle_time if pat.uses_pace else pat.total
+        self.progress = (self.progress + dt_ms / (cycle_time * 1000)) % 1
+        i, prog, rem = self._calc_phase_progress(self.progress, pat)
+        self._phase_idx = i
+        self._update_visuals(i, prog, rem)
+        self._schedule_next_frame()
+
+    def _schedule_next_frame(self):
+        delay = self.UPDATE_INTERVAL
+        if self._overshoot:
+            mean = sum(self._overshoot) / len(self._overshoot)
+            delay = max(1, min(self.UPDATE_INTERVAL, round(self.UPDATE_INTERVAL - mean)))
+        self._last_delay = delay
+        self._tick_id = self.master.after(delay, self._run_breathing_cycle)
+
+    def _calc_phase_progress(self, norm, pat):
+        t = norm * pat.total
+        i = bisect_right(pat.cum, t) - 1
+        e = t - pat.cum[i]  # 0 <= e <= phases[i], so progress stays within [0, 1]
+        return i, e * pat.inv_d[i], pat.phases[i] - e
+
+    def _update_visuals(self, i, prog, rem):
+        ext = self._ARC_SCALE * prog
+        color = self._phase_colors[i]
+        opts = ()
+        if color != self._last_outline:
+            opts += ("-outline", color)
+            self._last_outline = color
+        if abs(ext - self._last_extent) > 0.25:  # sub-pixel arc changes are invisible
+            opts += ("-extent", ext)
+            self._last_extent = ext
+        if opts:
+            self._tk_call(self._canvas_path, "itemconfigure", self.arc, *opts)
+        rem10 = int(rem * 10)
+        if (i, rem10) != self._last_text_key:
+            txt = f"{self._phase_display[i]}\n{rem10 / 10:.1f}s"
+            self._tk_call(self._canvas_path, "itemconfigure", self.text, "-text", txt)
+            self._last_text_key = (i, rem10)
+        a, b = self._phase_coeffs[i]
+        scale = a + b * prog
+        if scale != self._last_scale:  # holds use b == 0.0, so this is exact
+            self._update_circle_size(scale)
 
     def _update_circle_size(self, scale):
-        c = self.CANVAS_SIZE // 2
-        r = (c - self.CIRCLE_PADDING) * scale
-        coords = (c - r, c - r, c + r, c + r)
-        self.canvas.coords(self.circle, *coords)
-        self.canvas.coords(self.arc, *coords)
+        self._last_scale = scale
+        idx = int(scale * self.SCALE_STEPS)
+        if idx == self._last_scale_idx:
+            return
+        self._last_scale_idx = idx
+        coords = self._coord_lut[idx]
+        self._tk_call(self._canvas_path, "coords", self.circle, *coords)
+        self._tk_call(self._canvas_path, "coords", self.arc, *coords)
 
 if __name__ == "__main__":
     root = tk.Tk()